@@ -37,6 +37,11 @@ class McpClient:
         self.client = capnp.TwoPartyClient(connection)
         self.server = self.client.bootstrap().cast_as(mcp_schema.McpServer)
         
+        # Resolve request factories once instead of via __getattr__ per call
+        self._list_tools_req = self.server.listTools_request
+        self._call_tool_req = self.server.callTool_request
+        self._ping_req = self.server.ping_request
+        
         print(f"[CLIENT] Connected successfully!")
     
     async def disconnect(self):
@@ -52,7 +57,7 @@ class McpClient:
         print(f"[CLIENT] Requesting tool list...")
         
         # Use request pattern
-        request = self.server.listTools_request()
+        request = self._list_tools_req()
         response = await request.send()
         
         # Extract tools from response
@@ -70,29 +75,31 @@ class McpClient:
     async def call_tool(self, tool_name: str, arguments: dict):
         """Execute a tool on the server - corrected RPC pattern."""
         call_id = str(uuid.uuid4())
-        arguments_json = json.dumps(arguments)
         
         print(f"[CLIENT] Calling tool '{tool_name}' with call_id '{call_id}'")
         
+        # Time from serialization onwards so message building is measured too
+        start_ns = time.perf_counter_ns()
+        arguments_json = json.dumps(arguments)
+        
         # FIXED: Use the request pattern instead of creating ToolCall directly
-        request = self.server.callTool_request()
+        request = self._call_tool_req()
         
         # Set the call parameter fields
         request.call.name = tool_name
         request.call.arguments = arguments_json
         request.call.callId = call_id
 
-        # Send the request and measure time
-        start_time = time.time()
+        # Send the request
         response = await request.send()
-        end_time = time.time()
+        latency_ns = time.perf_counter_ns() - start_ns
         
         # Extract result
         result = {
             "call_id": response.result.callId,
             "success": response.result.success,
             "content": response.result.content,
-            "latency_ms": (end_time - start_time) * 1000
+            "latency_ms": latency_ns / 1_000_000
         }
         
         print(f"[CLIENT] Tool result: {result['content']} (took {result['latency_ms']:.2f}ms)")
@@ -100,13 +107,10 @@ class McpClient:
     
     async def ping(self):
         """Simple ping for latency testing - corrected RPC pattern."""
-        request = self.server.ping_request()
-
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        request = self._ping_req()
         response = await request.send()
-        end_time = time.time()
-        
-        latency_ms = (end_time - start_time) * 1000
+        latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         print(f"[CLIENT] Ping: {response.pong} (took {latency_ms:.2f}ms)")
         return latency_ms
 
@@ -143,4 +147,10 @@ async def test_basic_functionality():
         await client.disconnect()
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(capnp.run(test_basic_functionality()))
\ No newline at end of file
@@ -6,10 +6,78 @@ Provides the same GitHub operations as the stdio version.
 
 import asyncio
 import aiohttp
-import json
+import logging
+import orjson
 import os
+import signal
 from aiohttp import web
 
+logger = logging.getLogger(__name__)
+
+# Upstream GitHub connection pool; github_server.py and github_http_server.py
+# use the same values so the benchmark compares transports, not pool tuning
+GITHUB_POOL_LIMIT = 100
+GITHUB_DNS_CACHE_TTL = 300
+GITHUB_KEEPALIVE_TIMEOUT = 75
+GITHUB_REQUEST_TIMEOUT = 30
+
+GITHUB_TOOLS = [
+    {
+        "name": "create_github_issue",
+        "description": "Create a new GitHub issue",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string"},
+                "body": {"type": "string"}
+            },
+            "required": ["title"]
+        }
+    },
+    {
+        "name": "list_github_issues",
+        "description": "List GitHub issues",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "state": {"type": "string"}
+            }
+        }
+    },
+    {
+        "name": "get_github_issue",
+        "description": "Get a specific GitHub issue",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "issue_number": {"type": "number"}
+            },
+            "required": ["issue_number"]
+        }
+    }
+]
+
+# tools/list reply serialized once; only the request id is spliced in per call
+TOOLS_LIST_ID_SENTINEL = b'"__ID__"'
+TOOLS_LIST_TEMPLATE = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": "__ID__",
+    "result": {"tools": GITHUB_TOOLS}
+})
+
+# Bodies above this size are decoded off the event loop
+LARGE_PAYLOAD_BYTES = 32_768
+
+async def decode_json(raw):
+    """Decode JSON bytes, using a worker thread for large bodies."""
+    if len(raw) > LARGE_PAYLOAD_BYTES:
+        return await asyncio.to_thread(orjson.loads, raw)
+    return orjson.loads(raw)
+
+def json_response(data, status=200):
+    """Build a JSON response serialized with orjson."""
+    return web.Response(body=orjson.dumps(data), status=status, content_type="application/json")
+
 class GitHubHttpMcpServer:
     """Simple HTTP MCP server that mimics GitHub operations."""
     
@@ -23,16 +91,64 @@ class GitHubHttpMcpServer:
         self.base_url = "https://api.github.com"
         self.repo_url = f"{self.base_url}/repos/{self.github_repo}"
         
+        # Created in startup() once the event loop is running
+        self._session = None
+        # Added on top of the session headers for requests with a JSON body
+        self._write_headers = {'Content-Type': 'application/json'}
+        
         print(f"[HTTP_SERVER] Initialized for repo: {self.github_repo}")
     
+    async def startup(self, app):
+        """Open the shared GitHub API session."""
+        self._session = aiohttp.ClientSession(
+            headers={
+                'Authorization': f'token {self.github_token}',
+                'Accept': 'application/vnd.github.v3+json'
+            },
+            connector=aiohttp.TCPConnector(
+                limit=GITHUB_POOL_LIMIT,
+                ttl_dns_cache=GITHUB_DNS_CACHE_TTL,
+                keepalive_timeout=GITHUB_KEEPALIVE_TIMEOUT
+            ),
+            timeout=aiohttp.ClientTimeout(total=GITHUB_REQUEST_TIMEOUT)
+        )
+    
+    async def cleanup(self, app):
+        """Close the shared GitHub API session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+    
     async def handle_jsonrpc(self, request):
-        """Handle JSON-RPC requests."""
+        """Handle JSON-RPC requests, single or batched."""
         try:
-            data = await request.json()
-            
+            data = orjson.loads(await request.read())
+        except Exception as e:
+            return json_response(self._error_response(None, e), status=500)
+        
+        if data == []:
+            # JSON-RPC 2.0: an empty batch gets one Invalid Request error
+            return json_response(self._error_response(None, "Invalid Request", code=-32600), status=500)
+        
+        if isinstance(data, list):
+            # Batch: run every call concurrently and reply with one array
+            responses = await asyncio.gather(*(self._dispatch(item) for item in data))
+            return json_response(responses)
+        
+        if isinstance(data, dict) and data.get('method') == 'tools/list':
+            body = TOOLS_LIST_TEMPLATE.replace(TOOLS_LIST_ID_SENTINEL, orjson.dumps(data.get('id')))
+            return web.Response(body=body, content_type="application/json")
+        
+        response = await self._dispatch(data)
+        return json_response(response, status=500 if "error" in response else 200)
+    
+    async def _dispatch(self, data):
+        """Execute one JSON-RPC call and return its response object."""
+        request_id = None
+        try:
+            request_id = data.get('id')
             method = data.get('method')
             params = data.get('params', {})
-            request_id = data.get('id')
             
             if method == 'tools/call':
                 tool_name = params.get('name')
@@ -46,173 +162,119 @@ class GitHubHttpMcpServer:
                     result = await self._get_issue(arguments)
                 else:
                     raise ValueError(f"Unknown tool: {tool_name}")
-                
-                return web.json_response({
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": result
-                })
             
             elif method == 'tools/list':
-                return web.json_response({
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "tools": [
-                            {
-                                "name": "create_github_issue",
-                                "description": "Create a new GitHub issue",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "title": {"type": "string"},
-                                        "body": {"type": "string"}
-                                    },
-                                    "required": ["title"]
-                                }
-                            },
-                            {
-                                "name": "list_github_issues",
-                                "description": "List GitHub issues",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "state": {"type": "string"}
-                                    }
-                                }
-                            },
-                            {
-                                "name": "get_github_issue",
-                                "description": "Get a specific GitHub issue",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "issue_number": {"type": "number"}
-                                    },
-                                    "required": ["issue_number"]
-                                }
-                            }
-                        ]
-                    }
-                })
+                result = {"tools": GITHUB_TOOLS}
             
             else:
                 raise ValueError(f"Unknown method: {method}")
-                
-        except Exception as e:
-            return web.json_response({
+            
+            return {
                 "jsonrpc": "2.0",
-                "id": data.get('id') if 'data' in locals() else None,
-                "error": {
-                    "code": -32603,
-                    "message": str(e)
-                }
-            }, status=500)
+                "id": request_id,
+                "result": result
+            }
+        
+        except Exception as e:
+            return self._error_response(request_id, e)
+    
+    @staticmethod
+    def _error_response(request_id, error, code=-32603):
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {
+                "code": code,
+                "message": str(error)
+            }
+        }
     
     async def _create_issue(self, arguments):
         """Create GitHub issue via API."""
         title = arguments.get('title')
         body = arguments.get('body', '')
         
-        print(f"[HTTP_SERVER] Creating issue: '{title}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Creating issue: '%s'", title)
         
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Authorization': f'token {self.github_token}',
-                'Accept': 'application/vnd.github.v3+json',
-                'Content-Type': 'application/json'
-            }
+        payload = {
+            'title': title,
+            'body': body
+        }
+        
+        async with self._session.post(
+            f"{self.repo_url}/issues", data=orjson.dumps(payload), headers=self._write_headers
+        ) as response:
+            if response.status != 201:
+                error_text = await response.text()
+                raise Exception(f"GitHub API error: {response.status} - {error_text}")
             
-            payload = {
-                'title': title,
-                'body': body
-            }
+            issue_data = await decode_json(await response.read())
             
-            async with session.post(f"{self.repo_url}/issues", 
-                                  headers=headers, 
-                                  json=payload) as response:
-                if response.status != 201:
-                    error_text = await response.text()
-                    raise Exception(f"GitHub API error: {response.status} - {error_text}")
-                
-                issue_data = await response.json()
-                
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"Created issue #{issue_data['number']}: {issue_data['title']}"
-                        }
-                    ]
-                }
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Created issue #{issue_data['number']}: {issue_data['title']}"
+                    }
+                ],
+                "structuredContent": {"number": issue_data['number']}
+            }
     
     async def _list_issues(self, arguments):
         """List GitHub issues."""
         state = arguments.get('state', 'open')
         
-        print(f"[HTTP_SERVER] Listing {state} issues")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Listing %s issues", state)
         
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Authorization': f'token {self.github_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
+        params = {
+            'state': state,
+            'per_page': 30
+        }
+        
+        async with self._session.get(f"{self.repo_url}/issues", params=params) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"GitHub API error: {response.status} - {error_text}")
             
-            params = {
-                'state': state,
-                'per_page': 30
-            }
+            issues_data = await decode_json(await response.read())
             
-            async with session.get(f"{self.repo_url}/issues", 
-                                 headers=headers, 
-                                 params=params) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"GitHub API error: {response.status} - {error_text}")
-                
-                issues_data = await response.json()
-                
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"Found {len(issues_data)} issues"
-                        }
-                    ]
-                }
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Found {len(issues_data)} issues"
+                    }
+                ]
+            }
     
     async def _get_issue(self, arguments):
         """Get specific GitHub issue."""
         issue_number = arguments.get('issue_number')
         
-        print(f"[HTTP_SERVER] Getting issue #{issue_number}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Getting issue #%s", issue_number)
         
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Authorization': f'token {self.github_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
+        async with self._session.get(f"{self.repo_url}/issues/{issue_number}") as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"GitHub API error: {response.status} - {error_text}")
             
-            async with session.get(f"{self.repo_url}/issues/{issue_number}", 
-                                 headers=headers) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"GitHub API error: {response.status} - {error_text}")
-                
-                issue_data = await response.json()
-                
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"Issue #{issue_data['number']}: {issue_data['title']}"
-                        }
-                    ]
-                }
+            issue_data = await decode_json(await response.read())
+            
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Issue #{issue_data['number']}: {issue_data['title']}"
+                    }
+                ]
+            }
     
     async def health(self, request):
         """Health check endpoint."""
-        return web.json_response({
+        return json_response({
             "status": "healthy",
             "service": "github-http-mcp-server",
             "repo": self.github_repo
@@ -223,6 +285,8 @@ async def main():
     server = GitHubHttpMcpServer()
     
     app = web.Application()
+    app.on_startup.append(server.startup)
+    app.on_cleanup.append(server.cleanup)
     app.router.add_post('/', server.handle_jsonrpc)
     app.router.add_get('/health', server.health)
     
@@ -231,18 +295,33 @@ async def main():
     runner = web.AppRunner(app)
     await runner.setup()
     
-    site = web.TCPSite(runner, 'localhost', 8001)
+    # aiohttp already sets TCP_NODELAY on every accepted connection; reuse_address
+    # lets back-to-back benchmark runs rebind while old sockets sit in TIME_WAIT
+    site = web.TCPSite(runner, 'localhost', 8001, reuse_address=True)
     await site.start()
     
     print("[HTTP_SERVER] Server ready at http://localhost:8001")
     print("[HTTP_SERVER] Press Ctrl+C to stop")
     
+    # Sleep until SIGINT/SIGTERM instead of polling
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGINT, stop.set)
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    
     try:
-        while True:
-            await asyncio.sleep(1)
-    except KeyboardInterrupt:
+        await stop.wait()
+    finally:
         print("[HTTP_SERVER] Shutting down...")
         await runner.cleanup()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper())
+    
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -6,15 +6,44 @@ Direct replacement for JSON-RPC GitHub server for benchmarking.
 
 import asyncio
 import capnp
+import email.utils
 import os
 import aiohttp
-import json
+import orjson
+import logging
+import math
+import random
+import re
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Load GitHub schema
 SCHEMA_PATH = Path(__file__).parent / "github_mcp.capnp"
 github_schema = capnp.load(str(SCHEMA_PATH))
 
+logger = logging.getLogger(__name__)
+
+# Upstream GitHub connection pool; github_server.py and github_http_server.py
+# use the same values so the benchmark compares transports, not pool tuning
+GITHUB_POOL_LIMIT = 100
+GITHUB_DNS_CACHE_TTL = 300
+GITHUB_KEEPALIVE_TIMEOUT = 75
+GITHUB_REQUEST_TIMEOUT = 30
+
+# listIssues never asks GitHub for more than this many issues (10 pages)
+LIST_ISSUES_MAX_LIMIT = 1000
+GITHUB_PAGE_SIZE = 100
+
+# Page number of the rel="last" entry in a GitHub Link header
+LINK_LAST_PAGE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# Transient GitHub failures (429, and 5xx on reads) are retried with jittered
+# exponential backoff; a longer Retry-After than RETRY_MAX_DELAY is not waited out
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 5.0
+
 class GitHubMcpServerImpl(github_schema.GitHubMcpServer.Server):
     """GitHub MCP server using Cap'n Proto transport."""
     
@@ -28,39 +57,188 @@ class GitHubMcpServerImpl(github_schema.GitHubMcpServer.Server):
         self.base_url = "https://api.github.com"
         self.repo_url = f"{self.base_url}/repos/{self.github_repo}"
         
+        self._default_headers = {
+            'Authorization': f'token {self.github_token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+        # Added on top of the session headers for requests with a JSON body
+        self._write_headers = {'Content-Type': 'application/json'}
+        # Created on first use, once the event loop is running
+        self._session = None
+        
+        # Read cache: key -> (expires_at, etag, data, last_page), plus the in-flight
+        # refreshes. Off unless GITHUB_CACHE_TTL is set, so benchmark runs stay
+        # comparable with the uncached HTTP server.
+        self.cache_ttl = float(os.getenv('GITHUB_CACHE_TTL', '0'))
+        self._cache = {}
+        self._inflight = {}
+        
+        # Health-check reply, pre-encoded since it never changes
+        self._pong = f"GitHub MCP Server - {self.github_repo}".encode()
+        
+        # Bounds concurrent GitHub requests when one RPC fans out to many
+        self._sem = asyncio.Semaphore(16)
+        
         print(f"[GITHUB_SERVER] Initialized for repo: {self.github_repo}")
     
+    async def _get_session(self):
+        """Return the shared GitHub API session, creating it on first use."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=GITHUB_POOL_LIMIT,
+                    ttl_dns_cache=GITHUB_DNS_CACHE_TTL,
+                    keepalive_timeout=GITHUB_KEEPALIVE_TIMEOUT
+                ),
+                timeout=aiohttp.ClientTimeout(total=GITHUB_REQUEST_TIMEOUT),
+                headers=self._default_headers
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared GitHub API session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+    
+    async def _request(self, method, url, **kwargs):
+        """Send a GitHub API request and return (status, headers, body)."""
+        session = await self._get_session()
+        
+        for attempt in range(RETRY_ATTEMPTS):
+            async with session.request(method, url, **kwargs) as response:
+                # A 429 was never processed; a failed write may have been, so
+                # only reads are retried on 5xx
+                retryable = response.status == 429 or (response.status >= 500 and method == 'GET')
+                delay = None
+                if retryable and attempt < RETRY_ATTEMPTS - 1:
+                    delay = self._retry_delay(response.headers.get('Retry-After'), attempt)
+                
+                if delay is None or delay > RETRY_MAX_DELAY:
+                    return response.status, response.headers, await response.read()
+            
+            await asyncio.sleep(delay + random.uniform(0, RETRY_BASE_DELAY / 2))
+    
+    @staticmethod
+    def _retry_delay(retry_after, attempt):
+        """Seconds to wait before retrying, honouring Retry-After when it parses."""
+        backoff = RETRY_BASE_DELAY * 2 ** attempt
+        if not retry_after:
+            return backoff
+        
+        # Retry-After is either delay-seconds or an HTTP-date (RFC 9110)
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                retry_at = email.utils.parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                return backoff
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        
+        return max(delay, 0.0) if math.isfinite(delay) else backoff
+    
+    async def _get_json(self, key, url, params=None):
+        """GET a GitHub resource, going through the TTL/ETag cache when enabled.
+        
+        Returns (data, last_page), last_page being None unless GitHub paginated it.
+        """
+        if self.cache_ttl <= 0:
+            status, headers, body = await self._request('GET', url, params=params)
+            if status != 200:
+                raise Exception(f"GitHub API error: {status}")
+            return orjson.loads(body), self._last_page(headers)
+        
+        entry = self._cache.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[2], entry[3]
+        
+        # Single-flight: concurrent misses for one key share a single request
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._revalidate(key, url, params, entry))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        return await asyncio.shield(task)
+    
+    def _forget_inflight(self, key, task):
+        """Drop a finished refresh unless a newer one has replaced it."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    async def _revalidate(self, key, url, params, entry):
+        """Refresh one cache entry from GitHub."""
+        # Revalidate: a 304 costs no rate limit and carries no body
+        headers = {'If-None-Match': entry[1]} if entry and entry[1] else None
+        status, response_headers, body = await self._request('GET', url, params=params, headers=headers)
+        if status == 304 and entry:
+            etag, data, last_page = entry[1], entry[2], entry[3]
+        elif status == 200:
+            etag, data = response_headers.get('ETag'), orjson.loads(body)
+            last_page = self._last_page(response_headers)
+        else:
+            raise Exception(f"GitHub API error: {status}")
+        
+        # Skip the store if a createIssue invalidated this key meanwhile
+        if self._inflight.get(key) is asyncio.current_task():
+            self._cache[key] = (time.monotonic() + self.cache_ttl, etag, data, last_page)
+        return data, last_page
+    
+    @staticmethod
+    def _last_page(headers):
+        """Return the rel="last" page number from a Link header, if any."""
+        match = LINK_LAST_PAGE.search(headers.get('Link', ''))
+        return int(match.group(1)) if match else None
+    
+    async def _fetch_many(self, requests):
+        """GET several (key, url, params) resources concurrently, in order.
+        
+        The first failure cancels the fetches still running and is re-raised.
+        """
+        async def fetch(key, url, params):
+            async with self._sem:
+                data, _ = await self._get_json(key, url, params)
+                return data
+        
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(fetch(*request)) for request in requests]
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None
+        return [task.result() for task in tasks]
+    
     async def createIssue_context(self, context, **kwargs):
         """Create GitHub issue via API."""
         request = context.params.request
         title = request.title
         body = request.body
         
-        print(f"[GITHUB_SERVER] Creating issue: '{title}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Creating issue: '%s'", title)
         
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Authorization': f'token {self.github_token}',
-                'Accept': 'application/vnd.github.v3+json',
-                'Content-Type': 'application/json'
-            }
-            
-            payload = {
-                'title': title,
-                'body': body
-            }
-            
-            async with session.post(f"{self.repo_url}/issues", 
-                                  headers=headers, 
-                                  json=payload) as response:
-                if response.status != 201:
-                    raise Exception(f"GitHub API error: {response.status}")
-                
-                issue_data = await response.json()
-                
-                # Convert to Cap'n Proto struct
-                issue = self._create_github_issue(issue_data)
-                context.results.issue = issue
+        payload = {
+            'title': title,
+            'body': body
+        }
+        
+        status, _, response_body = await self._request(
+            'POST', f"{self.repo_url}/issues", data=orjson.dumps(payload), headers=self._write_headers
+        )
+        if status != 201:
+            raise Exception(f"GitHub API error: {status}")
+        
+        issue_data = orjson.loads(response_body)
+        
+        # Cached issue lists no longer include everything
+        for key in [key for key in self._cache if key[0] == "issues"]:
+            del self._cache[key]
+        for key in [key for key in self._inflight if key[0] == "issues"]:
+            del self._inflight[key]
+        
+        # Fill the result struct in place
+        self._fill_github_issue(context.results.init('issue'), issue_data)
     
     async def listIssues_context(self, context, **kwargs):
         """List GitHub issues."""
@@ -68,81 +246,85 @@ class GitHubMcpServerImpl(github_schema.GitHubMcpServer.Server):
         state = request.state if request.state else "open"
         limit = request.limit if request.limit else 30
         
-        print(f"[GITHUB_SERVER] Listing {state} issues (limit: {limit})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Listing %s issues (limit: %d)", state, limit)
         
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Authorization': f'token {self.github_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
+        limit = min(limit, LIST_ISSUES_MAX_LIMIT)
+        url = f"{self.repo_url}/issues"
+        if limit <= GITHUB_PAGE_SIZE:
+            params = {'state': state, 'per_page': limit}
+            issues_data, _ = await self._get_json(("issues", state, limit), url, params)
+        else:
+            # GitHub caps per_page at 100. Page 1's Link header says how many
+            # pages exist, so only those are fetched, all at once.
+            params = {'state': state, 'per_page': GITHUB_PAGE_SIZE, 'page': 1}
+            issues_data, last_page = await self._get_json(("issues", state, GITHUB_PAGE_SIZE, 1), url, params)
             
-            params = {
-                'state': state,
-                'per_page': min(limit, 100)  # GitHub API limit
-            }
-            
-            async with session.get(f"{self.repo_url}/issues", 
-                                 headers=headers, 
-                                 params=params) as response:
-                if response.status != 200:
-                    raise Exception(f"GitHub API error: {response.status}")
-                
-                issues_data = await response.json()
-                
-                # Convert to Cap'n Proto structs
-                issues_list = []
-                for issue_data in issues_data:
-                    issue = self._create_github_issue(issue_data)
-                    issues_list.append(issue)
-
-                context.results.issues = issues_list
+            pages_wanted = math.ceil(limit / GITHUB_PAGE_SIZE)
+            if last_page and len(issues_data) == GITHUB_PAGE_SIZE:
+                pages = await self._fetch_many([
+                    (("issues", state, GITHUB_PAGE_SIZE, page), url,
+                     {'state': state, 'per_page': GITHUB_PAGE_SIZE, 'page': page})
+                    for page in range(2, min(pages_wanted, last_page) + 1)
+                ])
+                issues_data = issues_data + [issue for page in pages for issue in page]
+            issues_data = issues_data[:limit]
+        
+        # Write straight into the result list so every issue lands in the
+        # outbound message's arena, with no per-issue message or final copy
+        issues = context.results.init('issues', len(issues_data))
+        for i, issue_data in enumerate(issues_data):
+            self._fill_github_issue(issues[i], issue_data)
     
     async def getIssue_context(self, context, **kwargs):
         """Get specific GitHub issue."""
         request = context.params.request
         number = request.number
         
-        print(f"[GITHUB_SERVER] Getting issue #{number}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Getting issue #%d", number)
         
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Authorization': f'token {self.github_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            async with session.get(f"{self.repo_url}/issues/{number}",
-                                 headers=headers) as response:
-                if response.status != 200:
-                    raise Exception(f"GitHub API error: {response.status}")
-                
-                issue_data = await response.json()
-                
-                # Convert to Cap'n Proto struct
-                issue = self._create_github_issue(issue_data)
-                context.results.issue = issue
+        issue_data, _ = await self._get_json(("issue", number), f"{self.repo_url}/issues/{number}")
+        
+        # Fill the result struct in place
+        self._fill_github_issue(context.results.init('issue'), issue_data)
+    
+    async def batchGetIssues_context(self, context, **kwargs):
+        """Get several GitHub issues, fetched concurrently."""
+        numbers = list(context.params.request.numbers)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Getting %d issues", len(numbers))
+        
+        issues_data = await self._fetch_many([
+            (("issue", number), f"{self.repo_url}/issues/{number}", None)
+            for number in numbers
+        ])
+        
+        issues = context.results.init('issues', len(issues_data))
+        for i, issue_data in enumerate(issues_data):
+            self._fill_github_issue(issues[i], issue_data)
     
     async def ping_context(self, context, **kwargs):
         """Health check."""
-        context.results.pong = f"GitHub MCP Server - {self.github_repo}"
+        context.results.pong = self._pong
 
-    def _create_github_issue(self, issue_data):
-        """Convert GitHub API response to Cap'n Proto GitHubIssue."""
-        issue = github_schema.GitHubIssue.new_message()
+    @staticmethod
+    def _fill_github_issue(issue, issue_data):
+        """Copy GitHub API issue fields into a GitHubIssue builder."""
+        # pycapnp stores UTF-8 bytes into Text fields faster than it converts str
         issue.number = issue_data['number']
-        issue.title = issue_data['title']
-        issue.body = issue_data.get('body', '') or ''
-        issue.state = issue_data['state']
-        issue.url = issue_data['html_url']
-        issue.createdAt = issue_data['created_at']
-        issue.updatedAt = issue_data['updated_at']
-        return issue
+        issue.title = issue_data['title'].encode()
+        issue.body = (issue_data.get('body', '') or '').encode()
+        issue.state = issue_data['state'].encode()
+        issue.url = issue_data['html_url'].encode()
+        issue.createdAt = issue_data['created_at'].encode()
+        issue.updatedAt = issue_data['updated_at'].encode()
 
-async def new_connection(connection):
+async def new_connection(connection, server_impl):
     """Handle new client connection."""
     print(f"[GITHUB_SERVER] New client connected")
     
-    server_impl = GitHubMcpServerImpl()
-    
     try:
         await capnp.TwoPartyServer(connection, bootstrap=server_impl).on_disconnect()
     except Exception as e:
@@ -154,8 +336,12 @@ async def run_server(port=8080):
     """Start the GitHub Cap'n Proto server."""
     print(f"[GITHUB_SERVER] Starting GitHub MCP Cap'n Proto server on port {port}")
     
+    # One impl for every client, so env parsing and the GitHub connection
+    # pool are set up once and shared across connections
+    server_impl = GitHubMcpServerImpl()
+    
     server = await capnp.AsyncIoStream.create_server(
-        new_connection, 'localhost', port
+        lambda connection: new_connection(connection, server_impl), 'localhost', port
     )
     
     print(f"[GITHUB_SERVER] Ready! Connect to localhost:{port}")
@@ -165,6 +351,12 @@ async def run_server(port=8080):
             await server.serve_forever()
     except KeyboardInterrupt:
         print("[GITHUB_SERVER] Shutting down...")
+    finally:
+        await server_impl.close()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper())
+    
+    # Stay on the default asyncio loop: pycapnp's server side segfaults under
+    # uvloop (clients are fine, so client.py and benchmark.py still use it)
     asyncio.run(capnp.run(run_server()))
\ No newline at end of file
@@ -6,7 +6,10 @@ Using correct pycapnp asyncio integration patterns.
 
 import asyncio
 import capnp
-import json
+import logging
+import math
+import orjson
+import os
 import time
 import uuid
 from pathlib import Path
@@ -15,6 +18,18 @@ from pathlib import Path
 SCHEMA_PATH = Path(__file__).parent / "mcp.capnp"
 mcp_schema = capnp.load(str(SCHEMA_PATH))
 
+logger = logging.getLogger(__name__)
+
+# slow_echo calls whose deadlines fall in the same tick share one timer
+SLOW_ECHO_DELAY = 0.1
+SLOW_ECHO_TICK = 0.001
+
+# Both tools take a single text argument; serialize the schema once
+TEXT_INPUT_SCHEMA = orjson.dumps({
+    "type": "object", 
+    "properties": {"text": {"type": "string"}}
+}).decode()
+
 class McpServerImpl(mcp_schema.McpServer.Server):
     """Implementation following correct pycapnp patterns."""
     
@@ -23,39 +38,45 @@ class McpServerImpl(mcp_schema.McpServer.Server):
             {
                 "name": "echo",
                 "description": "Echo back the input text",
-                "inputSchema": json.dumps({
-                    "type": "object", 
-                    "properties": {"text": {"type": "string"}}
-                })
+                "inputSchema": TEXT_INPUT_SCHEMA
             },
             {
                 "name": "slow_echo", 
                 "description": "Echo with 100ms delay (for testing)",
-                "inputSchema": json.dumps({
-                    "type": "object", 
-                    "properties": {"text": {"type": "string"}}
-                })
+                "inputSchema": TEXT_INPUT_SCHEMA
             }
         ]
-        print(f"[SERVER] Initialized with {len(self.tools)} tools")
-    
-    async def listTools_context(self, context, **kwargs):
-        """Return available tools using context."""
-        print(f"[SERVER] Client requesting tool list")
         
-        # Create a list of ToolDef messages
-        tools_list = []
+        # The tool list never changes, so build the ToolDef messages once
+        self._tool_defs = []
         for tool in self.tools:
             tool_msg = mcp_schema.ToolDef.new_message()
             tool_msg.name = tool['name']
             tool_msg.description = tool['description']
             tool_msg.inputSchema = tool['inputSchema']
-            tools_list.append(tool_msg)
+            self._tool_defs.append(tool_msg)
+        
+        # Health-check reply, pre-encoded since it never changes
+        self._pong = b"pong"
+        
+        # Pending slow_echo wakeups: deadline tick -> shared future
+        self._slow_waiters = {}
         
-        print(f"[SERVER] Returning {len(tools_list)} tools")
+        # Tool name -> handler, so dispatch is one dict lookup per call
+        self._handlers = {
+            "echo": self._handle_echo,
+            "slow_echo": self._handle_slow_echo
+        }
+        
+        print(f"[SERVER] Initialized with {len(self.tools)} tools")
+    
+    async def listTools_context(self, context, **kwargs):
+        """Return available tools using context."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Returning %d tools", len(self._tool_defs))
 
         # Set result through context
-        context.results.tools = tools_list
+        context.results.tools = self._tool_defs
 
     async def callTool_context(self, context, **kwargs):
         """Execute a tool call using context-based parameter access."""
@@ -67,62 +88,73 @@ class McpServerImpl(mcp_schema.McpServer.Server):
         arguments_json = call.arguments
         call_id = call.callId
         
-        print(f"[SERVER] Executing '{tool_name}' with call_id '{call_id}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing '%s' with call_id '%s'", tool_name, call_id)
 
         try:
-            arguments = json.loads(arguments_json)
-        except json.JSONDecodeError:
-            result = self._create_tool_result(call_id, False, "Error: Invalid JSON arguments")
-            context.results.result = result
-            return
-        
-        # Route to handlers
-        if tool_name == "echo":
-            result = await self._handle_echo(call_id, arguments)
-        elif tool_name == "slow_echo":
-            result = await self._handle_slow_echo(call_id, arguments)
+            arguments = orjson.loads(arguments_json)
+        except orjson.JSONDecodeError:
+            success, content = False, "Error: Invalid JSON arguments"
         else:
-            result = self._create_tool_result(call_id, False, f"Error: Unknown tool: {tool_name}")
-
-        # Set the result through context
-        context.results.result = result
+            # Route to handlers
+            handler = self._handlers.get(tool_name)
+            if handler is None:
+                success, content = False, f"Error: Unknown tool: {tool_name}"
+            else:
+                success, content = await handler(arguments)
+
+        # Write the result straight into the response message
+        self._fill_tool_result(context.results.init('result'), call_id, success, content)
     
     async def ping_context(self, context, **kwargs):
         """Health check using context."""
-        context.results.pong = "pong"
+        context.results.pong = self._pong
 
-    def _create_tool_result(self, call_id: str, success: bool, content: str):
-        """Helper to create proper ToolResult messages."""
-        result = mcp_schema.ToolResult.new_message()
-        result.callId = call_id
+    @staticmethod
+    def _fill_tool_result(result, call_id: str, success: bool, content: str):
+        """Copy tool outcome fields into a ToolResult builder."""
+        # pycapnp stores UTF-8 bytes into Text fields faster than it converts str
+        result.callId = call_id.encode()
         result.success = success
-        result.content = content
-        return result
+        result.content = content.encode()
 
-    async def _handle_echo(self, call_id: str, arguments: dict):
-        """Handle echo tool - return proper ToolResult."""
+    async def _handle_echo(self, arguments: dict):
+        """Handle echo tool - return (success, content)."""
         text = arguments.get("text", "")
         result_text = f"Echo: {text}"
 
-        print(f"[SERVER] Echo result: {result_text}")
-        return self._create_tool_result(call_id, True, result_text)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Echo result: %s", result_text)
+        return True, result_text
 
-    async def _handle_slow_echo(self, call_id: str, arguments: dict):
-        """Handle slow echo tool - return proper ToolResult."""
+    async def _handle_slow_echo(self, arguments: dict):
+        """Handle slow echo tool - return (success, content)."""
         text = arguments.get("text", "")
-        await asyncio.sleep(0.1)  # 100ms delay
+        await asyncio.shield(self._slow_echo_waiter())  # 100ms delay
 
         result_text = f"Slow Echo: {text}"
 
-        print(f"[SERVER] Slow echo result: {result_text}")
-        return self._create_tool_result(call_id, True, result_text)
-
-async def new_connection(connection):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Slow echo result: %s", result_text)
+        return True, result_text
+
+    def _slow_echo_waiter(self):
+        """Return a future that resolves once the slow_echo delay has passed."""
+        loop = asyncio.get_running_loop()
+        tick = math.ceil((loop.time() + SLOW_ECHO_DELAY) / SLOW_ECHO_TICK)
+        waiter = self._slow_waiters.get(tick)
+        if waiter is None:
+            waiter = self._slow_waiters[tick] = loop.create_future()
+            loop.call_at(tick * SLOW_ECHO_TICK, self._release_slow_waiters, tick)
+        return waiter
+
+    def _release_slow_waiters(self, tick):
+        """Wake every slow_echo call waiting on this tick."""
+        self._slow_waiters.pop(tick).set_result(None)
+
+async def new_connection(connection, server_impl):
     """Handle a new client connection - correct pycapnp pattern."""
     print(f"[SERVER] New client connected")
-
-    # Create server instance for this connection
-    server_impl = McpServerImpl()
     
     try:
         # Handle the connection with TwoPartyServer
@@ -136,9 +168,12 @@ async def run_server(port=8080):
     """Start the Cap'n Proto RPC server using correct pycapnp patterns."""
     print(f"[SERVER] Starting MCP Cap'n Proto server on port {port}")
     
+    # Shared by every connection; the tool registry is built once
+    server_impl = McpServerImpl()
+    
     # Use pycapnp's AsyncIoStream.create_server - handles KJ integration automatically
     server = await capnp.AsyncIoStream.create_server(
-        new_connection, 'localhost', port
+        lambda connection: new_connection(connection, server_impl), 'localhost', port
     )
     
     print(f"[SERVER] Server ready! Clients can connect to localhost:{port}")
@@ -151,6 +186,10 @@ async def run_server(port=8080):
         print("[SERVER] Shutting down...")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper())
+    
+    # Stay on the default asyncio loop: pycapnp's server side segfaults under
+    # uvloop (clients are fine, so client.py and benchmark.py still use it)
     # KEY FIX: Use capnp.run() instead of asyncio.run()
     # This automatically handles the KJ event loop integration
     asyncio.run(capnp.run(run_server()))
\ No newline at end of file